@@ -1,6 +1,200 @@
 import sys  # Importing the sys module, used to manipulate different parts of the Python runtime environment.
 import pickle  # Importing pickle module for serializing and de-serializing Python object structures.
 import os  # Importing os module to interact with the operating system.
+import time  # Importing time module to timestamp recorded changes.
+import copy  # Importing copy module so recorded history never shares mutable values with live records.
+
+
+class ChangeHistory:
+    # Append-only log of per-field changes made through the modify_* methods.
+    # Each entry only stores the fields that changed as (old, new) pairs, and a full copy of a
+    # record (a checkpoint) is written only the first time it changes and then every
+    # checkpoint_interval changes, so the file grows with the number of edits, not the dataset size.
+    def __init__(self, filename, checkpoint_interval=20):
+        self.filename = filename  # File the history entries are appended to.
+        self.checkpoint_interval = checkpoint_interval  # Deltas allowed between checkpoints of a record.
+        self.entries = []  # Every entry in the order it was written.
+        self.by_record = {}  # Record ID -> positions of its entries in self.entries.
+        self.since_checkpoint = {}  # Record ID -> deltas written since its last checkpoint.
+        self.undone = set()  # Sequence numbers of changes that have already been undone.
+        for entry in self.load_history():
+            self._index(entry)
+
+    def diff(self, record_id, record, changes):
+        # Work out which fields a change would alter; changes maps field -> new value.
+        # Must be called before the new values are applied so the old values can be captured.
+        # If a mutable field such as Event.guest_list was edited in place and the same object is passed
+        # back, the record already holds the new value, so the old one is taken from the last recorded
+        # state. A record with no earlier history has no old value to use: the change is still logged,
+        # but undoing it leaves the field as it is.
+        deltas = {}
+        recorded = None
+        for key, value in changes.items():
+            old = getattr(record, key, None)
+            if old is value and isinstance(value, (list, dict, set)):
+                if recorded is None:
+                    recorded = self.state_at(record_id, float('inf')) or {}
+                if key not in recorded:
+                    deltas[key] = (copy.deepcopy(value), copy.deepcopy(value))
+                    continue
+                old = recorded[key]
+            if old != value:
+                deltas[key] = (copy.deepcopy(old), copy.deepcopy(value))
+        return deltas
+
+    def record_change(self, record_id, record, deltas):
+        # Log deltas from diff once they have been applied to the record and saved.
+        if not deltas:
+            return None
+        before = copy.deepcopy(vars(record))
+        for key, (old, _) in deltas.items():
+            before[key] = old
+        return self._log(record_id, before, deltas)
+
+    def state_at(self, record_id, timestamp):
+        # Rebuild the fields of a record as they were at the given time (seconds since the epoch).
+        # Returns None if the record has no recorded history, or had been deleted by that time.
+        positions = self.by_record.get(record_id)
+        if not positions:
+            return None
+        # Start from the latest checkpoint taken at or before the timestamp; if the timestamp is
+        # earlier than any change, the first checkpoint already holds the state at that time.
+        start = positions[0]
+        for position in positions:
+            entry = self.entries[position]
+            if entry['time'] > timestamp:
+                break
+            if entry['kind'] == 'checkpoint':
+                start = position
+            elif entry['kind'] == 'end':
+                start = None  # Deleted; a later record with this ID starts again from its own checkpoint.
+        if start is None:
+            return None
+        state = dict(self.entries[start]['state'])
+        for position in positions:
+            entry = self.entries[position]
+            if position <= start or entry['kind'] == 'checkpoint':
+                continue
+            if entry['time'] > timestamp or entry['kind'] == 'end':
+                break
+            for key, (_, new) in entry['changes'].items():
+                state[key] = new
+        return copy.deepcopy(state)  # The caller gets its own copy, so editing it cannot alter the history.
+
+    def end_record(self, record_id):
+        # Mark a record's history as finished when it is deleted, so its changes are never
+        # replayed onto or undone against a later record that reuses the same ID.
+        positions = self.by_record.get(record_id)
+        if positions and self.entries[positions[-1]]['kind'] != 'end':
+            self._append({'kind': 'end', 'record_id': record_id, 'time': time.time()})
+
+    def undo(self, count, records, save):
+        # Revert the last count changes that have not been undone yet.
+        # records maps record ID -> live record object; changes to records that no longer exist are skipped.
+        # Undo stops at the first change whose fields no longer hold the values it set, since the record
+        # has been edited some other way since and reverting it (or anything older) would lose that edit.
+        # save is the manager's save method; the reverts are only logged once it has stored them.
+        # If it fails (by raising or by returning an error message) the records are put back as they were.
+        # Each revert is itself appended as a change, so the log stays append-only.
+        # Returns (number of changes reverted, None), or (number reverted, message) when undo stopped
+        # at such a change, or (0, error message) when the save failed.
+        reverts = []
+        conflict = None
+        ended = set()  # Records deleted after the entries still to be visited.
+        for entry in reversed(self.entries):
+            if len(reverts) >= count:
+                break
+            if entry['kind'] == 'end':
+                ended.add(entry['record_id'])
+            if entry['kind'] != 'change' or 'undo_of' in entry or entry['seq'] in self.undone:
+                continue
+            record = records.get(entry['record_id'])
+            if record is None or entry['record_id'] in ended:
+                continue
+            if any(getattr(record, key, None) != new for key, (_, new) in entry['changes'].items()):
+                conflict = (f"Undo stopped at a change to ID {entry['record_id']}, "
+                            f"which has been edited since that change was made.")
+                break
+            before = copy.deepcopy(vars(record))
+            deltas = copy.deepcopy({key: (new, old) for key, (old, new) in entry['changes'].items()})
+            for key, (_, old) in deltas.items():
+                setattr(record, key, copy.deepcopy(old))
+            reverts.append((entry, record, before, deltas))
+        if not reverts:
+            return 0, conflict
+        try:
+            error = save()
+        except Exception:
+            self._restore(reverts)
+            raise
+        if error is not None:
+            self._restore(reverts)
+            return 0, error
+        for entry, record, before, deltas in reverts:
+            self._log(entry['record_id'], before, deltas, undo_of=entry['seq'])
+        return len(reverts), conflict
+
+    def _restore(self, reverts):
+        # Put back the values reverted by undo when they could not be saved, newest revert last.
+        for entry, record, before, deltas in reversed(reverts):
+            for key in deltas:
+                setattr(record, key, before.get(key))
+
+    def _log(self, record_id, before, deltas, **extra):
+        # Append a change entry, preceded by a checkpoint of the record's previous state when one is due.
+        now = time.time()
+        if self.since_checkpoint.get(record_id, self.checkpoint_interval) >= self.checkpoint_interval:
+            self._append({'kind': 'checkpoint', 'record_id': record_id, 'time': now, 'state': before})
+        return self._append(dict({'kind': 'change', 'record_id': record_id, 'time': now, 'changes': deltas}, **extra))
+
+    def _append(self, entry):
+        # Give the entry the next sequence number, append it to the file and index it.
+        entry['seq'] = len(self.entries)
+        try:
+            with open(self.filename, 'ab') as f:
+                pickle.dump(entry, f)
+        except Exception as e:
+            print(f"Error saving history: {e}")
+        self._index(entry)
+        return entry
+
+    def _index(self, entry):
+        # Add an entry to the in-memory lookups used by state_at and undo.
+        self.entries.append(entry)
+        self.by_record.setdefault(entry['record_id'], []).append(len(self.entries) - 1)
+        if entry['kind'] == 'checkpoint':
+            self.since_checkpoint[entry['record_id']] = 0
+        elif entry['kind'] == 'end':
+            self.since_checkpoint.pop(entry['record_id'], None)  # The next change starts with a checkpoint.
+        else:
+            self.since_checkpoint[entry['record_id']] = self.since_checkpoint.get(entry['record_id'], 0) + 1
+            if 'undo_of' in entry:
+                self.undone.add(entry['undo_of'])
+
+    def load_history(self):
+        # Read every entry from the history file. If the end of the file is damaged (for example by a
+        # crash part-way through a write), the file is cut back to the last good entry so that new
+        # entries are not appended after the broken bytes.
+        entries = []
+        good_size = 0  # Offset just past the last entry that loaded cleanly.
+        try:
+            with open(self.filename, 'rb') as f:
+                while True:
+                    try:
+                        entries.append(pickle.load(f))
+                    except EOFError:
+                        break
+                    except Exception as e:  # A damaged pickle can raise UnpicklingError, OverflowError, ValueError, ...
+                        print(f"Error unpickling history: {e}")
+                        break
+                    good_size = f.tell()
+            if os.path.getsize(self.filename) > good_size:
+                print(f"Discarding damaged history after byte {good_size} of {self.filename}")
+                os.truncate(self.filename, good_size)
+        except FileNotFoundError:
+            pass  # No history has been recorded yet
+        return entries
+
 
 class Employee:
     # Initializer or constructor for the Employee class with multiple attributes.
@@ -25,6 +219,7 @@ class EmployeeManagement:
     def __init__(self, filename='employees.pkl'):
         self.filename = filename  # Filename where employee data is stored.
         self.employees = self.load_employees()  # Load employees from the file.
+        self.history = ChangeHistory(os.path.splitext(filename)[0] + '_history.pkl')  # Log of field changes.
 
     def get_employee_by_id(self, emp_id):
         # Search for an employee by their ID and return the employee object if found.
@@ -46,7 +241,8 @@ class EmployeeManagement:
         original_count = len(self.employees)
         self.employees = [e for e in self.employees if e.emp_id != emp_id]
         if len(self.employees) < original_count:
-            self.save_employees()
+            if self.save_employees() is None:  # Only end the history once the deletion has been saved.
+                self.history.end_record(emp_id)
             return "Employee deleted successfully."
         return "Employee not found."
 
@@ -54,12 +250,30 @@ class EmployeeManagement:
         # Modify attributes of an employee based on keyword arguments and save the changes if the employee exists.
         employee = self.get_employee_by_id(emp_id)
         if employee is not None:
+            deltas = self.history.diff(emp_id, employee, kwargs)  # Capture the old values before they are overwritten.
             for key, value in kwargs.items():
                 setattr(employee, key, value)
-            self.save_employees()
+            if self.save_employees() is None:  # Only log the change once it has been saved.
+                self.history.record_change(emp_id, employee, deltas)
             return "Employee updated successfully."
         return "Employee not found."
 
+    def undo_employee_changes(self, count=1):
+        # Revert the last count modifications made to employees and save the result.
+        reverted, problem = self.history.undo(count, {e.emp_id: e for e in self.employees}, self.save_employees)
+        if problem is not None:
+            return f"{reverted} employee change(s) undone. {problem}"
+        if reverted:
+            return f"{reverted} employee change(s) undone."
+        return "No employee changes to undo."
+
+    def employee_state_at(self, emp_id, timestamp):
+        # Return the employee's fields as they were at the given time, rebuilt from the change history.
+        state = self.history.state_at(emp_id, timestamp)
+        if state is not None:
+            return state
+        return "No history found for this employee."
+
     def display_employee_details(self, emp_id):
         # Display details of an employee if they are found using their ID.
         employee = self.get_employee_by_id(emp_id)
@@ -121,6 +335,7 @@ class EventManagement:
     def __init__(self, filename='events.pkl'):
         self.filename = filename
         self.events = self.load_events()
+        self.history = ChangeHistory(os.path.splitext(filename)[0] + '_history.pkl')  # Log of field changes.
 
     def add_event(self, event):
         # Add an event to the list if it does not already exist by its ID.
@@ -141,6 +356,7 @@ class EventManagement:
         self.events = [e for e in self.events if e.event_id != event_id]
         if len(self.events) < original_count:
             self.save_events()
+            self.history.end_record(event_id)
             return "Event deleted successfully."
         return "Event not found."
 
@@ -148,12 +364,30 @@ class EventManagement:
         # Modify attributes of an event based on keyword arguments and save the changes if the event exists.
         for event in self.events:
             if event.event_id == event_id:
+                deltas = self.history.diff(event_id, event, kwargs)  # Capture the old values before they are overwritten.
                 for key, value in kwargs.items():
                     setattr(event, key, value)
                 self.save_events()
+                self.history.record_change(event_id, event, deltas)  # Only reached once the save has succeeded.
                 return "Event updated successfully."
         return "Event not found."
 
+    def undo_event_changes(self, count=1):
+        # Revert the last count modifications made to events and save the result.
+        reverted, problem = self.history.undo(count, {e.event_id: e for e in self.events}, self.save_events)
+        if problem is not None:
+            return f"{reverted} event change(s) undone. {problem}"
+        if reverted:
+            return f"{reverted} event change(s) undone."
+        return "No event changes to undo."
+
+    def event_state_at(self, event_id, timestamp):
+        # Return the event's fields as they were at the given time, rebuilt from the change history.
+        state = self.history.state_at(event_id, timestamp)
+        if state is not None:
+            return state
+        return "No history found for this event."
+
     def find_event(self, event_id):
         # Find and return an event by its ID.
         for event in self.events:
@@ -198,6 +432,7 @@ class ClientManagement:
         # Initialization method for the ClientManagement class
         self.filename = filename  # File to store client data
         self.clients = self.load_clients()  # Load existing clients from file
+        self.history = ChangeHistory(os.path.splitext(filename)[0] + '_history.pkl')  # Log of field changes
 
     def add_client(self, client):
         # Add a new client to the system
@@ -213,6 +448,7 @@ class ClientManagement:
         self.clients = [c for c in self.clients if c.client_id != client_id]
         if len(self.clients) < original_count:
             self.save_clients()  # Save the updated list to file after deletion
+            self.history.end_record(client_id)
             return "Client deleted successfully."
         return "Client not found."
 
@@ -220,12 +456,30 @@ class ClientManagement:
         # Modify attributes of an existing client
         for client in self.clients:
             if client.client_id == client_id:
+                deltas = self.history.diff(client_id, client, kwargs)  # Capture old values before they are overwritten
                 for key, value in kwargs.items():
                     setattr(client, key, value)  # Set new values for attributes
                 self.save_clients()  # Save changes to file
+                self.history.record_change(client_id, client, deltas)  # Log the change once it has been saved
                 return f"Client {client_id} updated successfully."
         return "Client not found."
 
+    def undo_client_changes(self, count=1):
+        # Revert the last count modifications made to clients
+        reverted, problem = self.history.undo(count, {c.client_id: c for c in self.clients}, self.save_clients)
+        if problem is not None:
+            return f"{reverted} client change(s) undone. {problem}"
+        if reverted:
+            return f"{reverted} client change(s) undone."
+        return "No client changes to undo."
+
+    def client_state_at(self, client_id, timestamp):
+        # Rebuild a client's details as they were at the given time from the change history
+        state = self.history.state_at(client_id, timestamp)
+        if state is not None:
+            return state
+        return "No history found for this client."
+
     def find_client(self, client_id):
         # Retrieve a client's details by ID
         for client in self.clients:
@@ -277,6 +531,7 @@ class GuestManagement:
     def __init__(self, filename='guests.pkl'):
         self.filename = filename
         self.guests = self.load_guests()  # Loads guests from a file on initialization
+        self.history = ChangeHistory(os.path.splitext(filename)[0] + '_history.pkl')  # Log of field changes
 
     # Adds a guest to the guest list if they don't already exist
     def add_guest(self, guest):
@@ -293,6 +548,7 @@ class GuestManagement:
         self.guests = [g for g in self.guests if g.guest_id != guest_id]  # Filter out the guest to delete
         if len(self.guests) < original_count:
             self.save_guests()  # Save the updated list to file
+            self.history.end_record(guest_id)
             return "Guest deleted successfully."
         return "Guest not found."
 
@@ -300,13 +556,31 @@ class GuestManagement:
     def modify_guest(self, guest_id, **kwargs):
         for guest in self.guests:
             if guest.guest_id == guest_id:
+                deltas = self.history.diff(guest_id, guest, kwargs)  # Capture old values before they are overwritten
                 # Update attributes provided in kwargs
                 for key, value in kwargs.items():
                     setattr(guest, key, value)
                 self.save_guests()  # Save the updated list to file
+                self.history.record_change(guest_id, guest, deltas)  # Log the change once it has been saved
                 return f"Guest {guest_id} updated successfully."
         return "Guest not found."
 
+    # Reverts the last count modifications made to guests
+    def undo_guest_changes(self, count=1):
+        reverted, problem = self.history.undo(count, {g.guest_id: g for g in self.guests}, self.save_guests)
+        if problem is not None:
+            return f"{reverted} guest change(s) undone. {problem}"
+        if reverted:
+            return f"{reverted} guest change(s) undone."
+        return "No guest changes to undo."
+
+    # Rebuilds a guest's details as they were at the given time from the change history
+    def guest_state_at(self, guest_id, timestamp):
+        state = self.history.state_at(guest_id, timestamp)
+        if state is not None:
+            return state
+        return "No history found for this guest."
+
     # Finds a guest by their ID
     def find_guest(self, guest_id):
         for guest in self.guests:
@@ -365,6 +639,7 @@ class SupplierManagement:
         # Load suppliers from file on initialization.
         self.filename = filename
         self.suppliers = self.load_suppliers()
+        self.history = ChangeHistory(os.path.splitext(filename)[0] + '_history.pkl')
 
     def add_supplier(self, supplier):
         # Add a new supplier to the dictionary if not already present, save to file.
@@ -379,6 +654,7 @@ class SupplierManagement:
         if supplier_id in self.suppliers:
             del self.suppliers[supplier_id]
             self.save_suppliers()
+            self.history.end_record(supplier_id)
             return "Supplier deleted successfully."
         return "Supplier not found."
 
@@ -387,11 +663,29 @@ class SupplierManagement:
         if supplier_id not in self.suppliers:
             return "Supplier not found."
         supplier = self.suppliers[supplier_id]
+        deltas = self.history.diff(supplier_id, supplier, kwargs)
         for key, value in kwargs.items():
             setattr(supplier, key, value)
         self.save_suppliers()
+        self.history.record_change(supplier_id, supplier, deltas)
         return "Supplier updated successfully."
 
+    def undo_supplier_changes(self, count=1):
+        # Revert the last count modifications made to suppliers, save to file.
+        reverted, problem = self.history.undo(count, self.suppliers, self.save_suppliers)
+        if problem is not None:
+            return f"{reverted} supplier change(s) undone. {problem}"
+        if reverted:
+            return f"{reverted} supplier change(s) undone."
+        return "No supplier changes to undo."
+
+    def supplier_state_at(self, supplier_id, timestamp):
+        # Rebuild a supplier's attributes as they were at the given time from the change history.
+        state = self.history.state_at(supplier_id, timestamp)
+        if state is not None:
+            return state
+        return "No history found for this supplier."
+
     def find_supplier(self, supplier_id):
         # Retrieve a supplier by ID from the dictionary.
         return self.suppliers.get(supplier_id, "Supplier not found.")
@@ -435,6 +729,7 @@ class VenueManagement:
         # Constructor for VenueManagement class with default filename for storage
         self.filename = filename
         self.venues = self.load_venues()  # Load venues from the file when an instance is created
+        self.history = ChangeHistory(os.path.splitext(filename)[0] + '_history.pkl')  # Log of field changes
 
     def add_venue(self, venue):
         # Add a new venue to the list if it does not already exist based on venue_id
@@ -450,6 +745,7 @@ class VenueManagement:
         self.venues = [v for v in self.venues if v.venue_id != venue_id]
         if len(self.venues) < original_count:
             self.save_venues()
+            self.history.end_record(venue_id)
             return "Venue deleted successfully."
         return "Venue not found."
 
@@ -457,12 +753,30 @@ class VenueManagement:
         # Modify attributes of a specific venue using keyword arguments
         for venue in self.venues:
             if venue.venue_id == venue_id:
+                deltas = self.history.diff(venue_id, venue, kwargs)  # Capture old values before they are overwritten
                 for key, value in kwargs.items():
                     setattr(venue, key, value)  # Update attributes if the venue is found
                 self.save_venues()
+                self.history.record_change(venue_id, venue, deltas)  # Log the change once it has been saved
                 return f"Venue {venue_id} updated successfully."
         return "Venue not found."
 
+    def undo_venue_changes(self, count=1):
+        # Revert the last count modifications made to venues and save the changes
+        reverted, problem = self.history.undo(count, {v.venue_id: v for v in self.venues}, self.save_venues)
+        if problem is not None:
+            return f"{reverted} venue change(s) undone. {problem}"
+        if reverted:
+            return f"{reverted} venue change(s) undone."
+        return "No venue changes to undo."
+
+    def venue_state_at(self, venue_id, timestamp):
+        # Rebuild a venue's attributes as they were at the given time from the change history
+        state = self.history.state_at(venue_id, timestamp)
+        if state is not None:
+            return state
+        return "No history found for this venue."
+
     def find_venue(self, venue_id):
         # Find and return a venue by its venue_id
         for venue in self.venues:
@@ -0,0 +1,115 @@
+import os  # Importing os module to work with the temporary data files.
+import tempfile  # Importing tempfile module so the checks never touch the real data files.
+from Classes import Employee, EmployeeManagement, Event, EventManagement
+
+# Quick checks for the change history kept by the management classes.
+# Run with: python check_history.py
+
+
+def make_employee(emp_id, age=30):
+    return Employee('Sam', emp_id, 'Sales', 'Clerk', 1000, age, '01/01/1990', 'P123')
+
+
+def make_event(event_id, guest_list):
+    return Event(event_id, 'Wedding', 'Garden', '01/06/2025', '14:00', 5, '1 High St', 1, guest_list,
+                 'Cater Co', 'Clean Co', 'Decor Co', 'Fun Co', 'Chairs Co', 'INV1')
+
+
+def check_truncated_history_reloads():
+    # A partial entry at the end of the history file is cut off, and later entries still load.
+    manager = EmployeeManagement('employees.pkl')
+    manager.add_employee(make_employee(1))
+    manager.modify_employee(1, age=40)
+    with open('employees_history.pkl', 'ab') as f:
+        f.write(b'\x80\x05\x95\xff\xff\xff\xff\xff\xff\xff\x7f')  # Frame header claiming a huge entry.
+    manager = EmployeeManagement('employees.pkl')
+    assert len(manager.history.entries) == 2
+    manager.modify_employee(1, age=41)
+    manager = EmployeeManagement('employees.pkl')
+    assert len(manager.history.entries) == 3
+    assert manager.undo_employee_changes(2) == "2 employee change(s) undone."
+    assert manager.get_employee_by_id(1).age == 30
+
+
+def check_failed_save_during_undo():
+    # When undo cannot save, the record keeps its current values and nothing is logged.
+    manager = EmployeeManagement('employees.pkl')
+    manager.add_employee(make_employee(1))
+    manager.modify_employee(1, basic_salary=2000)
+    entries = len(manager.history.entries)
+    manager.filename = os.path.join('missing', 'employees.pkl')
+    result = manager.undo_employee_changes(1)
+    assert result.startswith("0 employee change(s) undone. Error saving employees")
+    assert manager.get_employee_by_id(1).basic_salary == 2000
+    assert len(manager.history.entries) == entries
+    manager.filename = 'employees.pkl'
+    assert manager.undo_employee_changes(1) == "1 employee change(s) undone."
+    assert manager.get_employee_by_id(1).basic_salary == 1000
+
+
+def check_failed_save_during_delete():
+    # A deletion that was not saved must not end the record's history.
+    manager = EventManagement('events.pkl')
+    manager.add_event(make_event(1, ['Ann']))
+    manager.modify_event(1, theme='Beach')
+    manager.filename = os.path.join('missing', 'events.pkl')
+    try:
+        manager.delete_event(1)
+    except OSError:
+        pass
+    manager = EventManagement('events.pkl')
+    assert manager.event_state_at(1, float('inf'))['theme'] == 'Beach'
+    assert manager.undo_event_changes(1) == "1 event change(s) undone."
+    assert manager.find_event(1).theme == 'Garden'
+
+
+def check_undo_stops_at_changed_record():
+    # Undo stops at a change that was overwritten outside modify_* instead of skipping to older ones.
+    manager = EmployeeManagement('employees.pkl')
+    manager.add_employee(make_employee(1))
+    manager.modify_employee(1, name='Alex')
+    manager.modify_employee(1, basic_salary=2000)
+    manager.get_employee_by_id(1).basic_salary = 3000
+    result = manager.undo_employee_changes(1)
+    assert result.startswith("0 employee change(s) undone. Undo stopped")
+    assert manager.get_employee_by_id(1).name == 'Alex'
+    assert manager.get_employee_by_id(1).basic_salary == 3000
+
+
+def check_reused_id_after_delete():
+    # Changes made to a deleted record are never applied to a new record with the same ID.
+    manager = EmployeeManagement('employees.pkl')
+    manager.add_employee(make_employee(1))
+    manager.modify_employee(1, age=50)
+    manager.delete_employee(1)
+    manager.add_employee(make_employee(1, age=20))
+    assert manager.undo_employee_changes(1) == "No employee changes to undo."
+    assert manager.get_employee_by_id(1).age == 20
+
+
+def check_in_place_list_edit():
+    # Editing a guest list in place and passing it back is still recorded and can be undone.
+    manager = EventManagement('events.pkl')
+    manager.add_event(make_event(1, ['Ann']))
+    manager.modify_event(1, guest_list=['Ann', 'Bob'])
+    guest_list = manager.find_event(1).guest_list
+    guest_list.append('Cat')
+    manager.modify_event(1, guest_list=guest_list)
+    assert manager.undo_event_changes(1) == "1 event change(s) undone."
+    assert manager.find_event(1).guest_list == ['Ann', 'Bob']
+
+
+if __name__ == '__main__':
+    checks = [check_truncated_history_reloads, check_failed_save_during_undo, check_failed_save_during_delete,
+              check_undo_stops_at_changed_record, check_reused_id_after_delete, check_in_place_list_edit]
+    original_dir = os.getcwd()
+    for check in checks:
+        # Each check runs in its own empty folder so the data files start out empty.
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)
+            try:
+                check()
+            finally:
+                os.chdir(original_dir)
+        print(f"{check.__name__}: OK")
+    print("All history checks passed.")